@@ -2,23 +2,81 @@ import argparse
 
 import kiss_matcher
 import numpy as np
-import viser
-from kiss_matcher.io_utils import read_bin, read_pcd, read_ply
+from kiss_matcher.io_utils import finite_mask, read_point_cloud
+
+GRAY = np.array([200, 200, 200], dtype=np.uint8)
+CYAN = np.array([90, 165, 230], dtype=np.uint8)
+ORANGE = np.array([255, 160, 0], dtype=np.uint8)
 
 
 def remove_nan_from_point_cloud(point_cloud):
-    return point_cloud[np.isfinite(point_cloud).any(axis=1)]
+    # NOTE: A point is kept only if *all* of its coordinates are finite.
+    # Filtering with `.any` let points such as (NaN, 1, 1) through, and
+    # infinities are dropped here as well.
+    return point_cloud[finite_mask(point_cloud)]
 
 
 def rotate_point_cloud_yaw(point_cloud, yaw_angle_deg):
+    # A yaw rotation leaves z untouched, so only x and y are rotated
     yaw_angle_rad = np.radians(yaw_angle_deg)
-    rotation_matrix = np.array([
-        [np.cos(yaw_angle_rad), -np.sin(yaw_angle_rad), 0],
-        [np.sin(yaw_angle_rad),
-         np.cos(yaw_angle_rad), 0],
-        [0, 0, 1],
-    ])
-    return (rotation_matrix @ point_cloud.T).T
+    c, s = np.cos(yaw_angle_rad), np.sin(yaw_angle_rad)
+    x, y = point_cloud[:, 0], point_cloud[:, 1]
+    rotated = np.empty_like(point_cloud)
+    rotated[:, 0] = c * x - s * y
+    rotated[:, 1] = s * x + c * y
+    rotated[:, 2] = point_cloud[:, 2]
+    return rotated
+
+
+def visualize_with_viser(src, tgt, transformed_src):
+    # NOTE: viser pulls in a web server and asyncio, so it is only imported
+    # when the visualization is actually requested.
+    import threading
+
+    import viser
+
+    # Create Viser server for visualization
+    server = viser.ViserServer()
+    print("Viser server started. Open the web interface to view the point clouds.")
+    print("Server URL: http://localhost:8080")
+
+    # Add point clouds to viser
+    server.scene.add_point_cloud(
+        "/source_cloud",
+        points=src,
+        colors=np.broadcast_to(GRAY, src.shape),
+        point_size=0.03,
+    )
+
+    server.scene.add_point_cloud(
+        "/target_cloud",
+        points=tgt,
+        colors=np.broadcast_to(CYAN, tgt.shape),
+        point_size=0.03,
+    )
+
+    server.scene.add_point_cloud(
+        "/transformed_source",
+        points=transformed_src,
+        colors=np.broadcast_to(ORANGE, transformed_src.shape),
+        point_size=0.03,
+    )
+
+    print("Point clouds added to visualization:")
+    print("- Gray: Original source cloud")
+    print("- Cyan: Target cloud")
+    print("- Orange: Transformed source cloud")
+    print("\nPress Ctrl+C to exit...")
+
+    try:
+        # Keep server running until interrupted. NOTE: An untimed wait cannot be
+        # interrupted by Ctrl+C on Windows, so wake up periodically.
+        stop = threading.Event()
+        while not stop.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        print("\nVisualization stopped.")
+        server.stop()
 
 
 if __name__ == "__main__":
@@ -53,38 +111,35 @@ if __name__ == "__main__":
         required=False,
         help="Yaw augmentation angle in degrees",
     )
+    parser.add_argument(
+        "--no_viz",
+        action="store_true",
+        help="Skip the Viser visualization (e.g., for headless runs)",
+    )
 
     args = parser.parse_args()
 
     # Load source point cloud
-    if args.src_path.endswith(".bin"):
-        src = read_bin(args.src_path)
-    elif args.src_path.endswith(".pcd"):
-        src = read_pcd(args.src_path)
-    elif args.src_path.endswith(".ply"):
-        src = read_ply(args.src_path)
-    else:
-        raise ValueError("Unsupported file format for src. Use .bin, .pcd, or .ply")
+    src = read_point_cloud(args.src_path)
 
     # Apply yaw augmentation if provided
     if args.yaw_aug_angle is not None:
         src = rotate_point_cloud_yaw(src, args.yaw_aug_angle)
 
     # Load target point cloud
-    if args.tgt_path.endswith(".bin"):
-        tgt = read_bin(args.tgt_path)
-    elif args.tgt_path.endswith(".pcd"):
-        tgt = read_pcd(args.tgt_path)
-    elif args.tgt_path.endswith(".ply"):
-        tgt = read_ply(args.tgt_path)
-    else:
-        raise ValueError("Unsupported file format for tgt. Use .bin, .pcd, or .ply")
+    tgt = read_point_cloud(args.tgt_path)
 
     # Remove NaN values from the point cloud.
     # See https://github.com/MIT-SPARK/KISS-Matcher/pull/16
     src = remove_nan_from_point_cloud(src)
     tgt = remove_nan_from_point_cloud(tgt)
 
+    # Keep the clouds as contiguous (N, 3) float32 buffers from here on,
+    # so that `estimate` reads them through its numpy overload without an
+    # extra cast, and the transforms below run as a single row-major GEMM.
+    src = np.ascontiguousarray(src, dtype=np.float32)
+    tgt = np.ascontiguousarray(tgt, dtype=np.float32)
+
     print(f"Loaded source point cloud: {src.shape}")
     print(f"Loaded target point cloud: {tgt.shape}")
     print(f"Resolution: {args.resolution}")
@@ -110,49 +165,9 @@ if __name__ == "__main__":
     # ------------------------------------------------------------
     # Visualization with Viser
     # ------------------------------------------------------------
-    # Apply transformation to src
-    rotation_matrix = np.array(result.rotation)
-    translation_vector = np.array(result.translation)
-    transformed_src = (rotation_matrix @ src.T).T + translation_vector
-
-    # Create Viser server for visualization
-    server = viser.ViserServer()
-    print("Viser server started. Open the web interface to view the point clouds.")
-    print("Server URL: http://localhost:8080")
-
-    # Add point clouds to viser
-    server.scene.add_point_cloud(
-        "/source_cloud",
-        points=src.astype(np.float32),
-        colors=np.array([[200, 200, 200] for _ in range(src.shape[0])], dtype=np.uint8),  # Gray
-        point_size=0.03,
-    )
-
-    server.scene.add_point_cloud(
-        "/target_cloud",
-        points=tgt.astype(np.float32),
-        colors=np.array([[90, 165, 230] for _ in range(tgt.shape[0])], dtype=np.uint8),  # Cyan
-        point_size=0.03,
-    )
-
-    server.scene.add_point_cloud(
-        "/transformed_source",
-        points=transformed_src.astype(np.float32),
-        colors=np.array([[255, 160, 0] for _ in range(transformed_src.shape[0])], dtype=np.uint8),  # Orange
-        point_size=0.03,
-    )
-
-    print("Point clouds added to visualization:")
-    print("- Gray: Original source cloud")
-    print("- Cyan: Target cloud")
-    print("- Orange: Transformed source cloud")
-    print("\nPress Ctrl+C to exit...")
-
-    try:
-        # Keep server running
-        while True:
-            import time
-            time.sleep(1.0)
-    except KeyboardInterrupt:
-        print("\nVisualization stopped.")
-        server.stop()
+    if not args.no_viz:
+        # Apply transformation to src
+        rotation_matrix = np.asarray(result.rotation, dtype=np.float32)
+        translation_vector = np.asarray(result.translation, dtype=np.float32)
+        transformed_src = src @ rotation_matrix.T + translation_vector
+        visualize_with_viser(src, tgt, transformed_src)
@@ -28,7 +28,6 @@ simply::
 """
 from importlib import import_module as _im
 __version__ = "1.0.0"
-__all__ = []
 # Import the backend that CMake just built (“_kiss_matcher” lives inside
 # the same package directory thanks to the change above).
 try:
@@ -39,9 +38,7 @@ except ModuleNotFoundError:
     _backend = _im("_kiss_matcher")
 # Re-export every non-private attribute so that they appear directly under
 # the top-level `kiss_matcher` namespace.
-for _name in dir(_backend):
-    if not _name.startswith("_"):
-        globals()[_name] = getattr(_backend, _name)
-        __all__.append(_name)
-# Keep a private reference so the module isn’t garbage-collected.
-del _backend, _name, _im
+__all__ = [_k for _k in vars(_backend) if not _k.startswith("_")]
+globals().update({_k: getattr(_backend, _k) for _k in __all__})
+# Drop the helpers so they don't leak into the package namespace.
+del _backend, _im
@@ -2,32 +2,94 @@
 Lightweight I/O utilities for point cloud files without heavy dependencies.
 Replaces Open3D for basic file operations.
 """
-import struct
+import math
+import os
+from pathlib import Path
+
 import numpy as np
 
+# PCD TYPE entries and their numpy kind codes (combined with SIZE)
+_PCD_TYPES = {
+    'F': 'f',
+    'U': 'u',
+    'I': 'i',
+}
+
+# PLY scalar property types and their numpy equivalents
+_PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1',
+    'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2',
+    'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4',
+    'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4',
+    'double': 'f8', 'float64': 'f8',
+}
+
+_PLY_ENDIANNESS = {
+    'binary_little_endian': '<',
+    'binary_big_endian': '>',
+}
+
+
+def _pcd_dtype(header_info):
+    """
+    Build the packed numpy dtype of a single point from the PCD
+    FIELDS/SIZE/TYPE/COUNT header entries.
+    """
+    fields = header_info.get('fields', [])
+    sizes = header_info.get('size', [4] * len(fields))
+    types = header_info.get('type', ['F'] * len(fields))
+    counts = header_info.get('count', [1] * len(fields))
+
+    dtype_list = []
+    for i, (field, size, type_, count) in enumerate(zip(fields, sizes, types, counts)):
+        kind = _PCD_TYPES.get(type_.upper())
+        if kind is None:
+            raise ValueError(f"Unsupported PCD field type: {type_}")
+        # Padding fields (e.g., '_') may repeat, but dtype names must be unique
+        name = field if field not in fields[:i] else f'{field}_{i}'
+        if count == 1:
+            dtype_list.append((name, f'<{kind}{size}'))
+        else:
+            dtype_list.append((name, f'<{kind}{size}', (count,)))
+    return np.dtype(dtype_list)
+
+
+def _xyz_from_structured(data):
+    """
+    Copy the x, y, z fields of a structured array into a pre-sized
+    (N, 3) float32 array, casting in place instead of stacking and
+    converting afterwards.
+    """
+    points = np.empty((data.shape[0], 3), dtype=np.float32)
+    points[:, 0] = data['x']
+    points[:, 1] = data['y']
+    points[:, 2] = data['z']
+    return points
+
 
 def read_pcd(pcd_path):
     """
     Read PCD file without Open3D dependency.
     Supports ASCII and binary PCD formats.
+    Returns the x, y, z coordinates as an (N, 3) float32 array.
     """
     # First, read the header as text to determine format
     header_info = {}
-    header_lines = []
+    header_size = 0
 
     with open(pcd_path, 'rb') as f:
         while True:
             line = f.readline()
-            if isinstance(line, bytes):
-                try:
-                    line_str = line.decode('utf-8').strip()
-                except UnicodeDecodeError:
-                    # If we can't decode, we've hit the binary data
-                    break
-            else:
-                line_str = line.strip()
-
-            header_lines.append(line_str)
+            if not line:
+                raise ValueError("PCD header is missing the DATA line")
+            try:
+                line_str = line.decode('utf-8').strip()
+            except UnicodeDecodeError:
+                # If we can't decode, we've hit the binary data
+                break
 
             if line_str.startswith('VERSION'):
                 header_info['version'] = line_str.split()[1]
@@ -49,112 +111,110 @@ def read_pcd(pcd_path):
                 header_info['points'] = int(line_str.split()[1])
             elif line_str.startswith('DATA'):
                 header_info['data'] = line_str.split()[1]
+                # Point data starts right after the DATA line
+                header_size = f.tell()
                 break
 
-    # Calculate header size in bytes
-    header_size = sum(len(line.encode('utf-8')) + 1 for line in header_lines)
-
     # Read point data
     if header_info.get('data', '').upper() == 'ASCII':
         # ASCII format
-        with open(pcd_path, 'r') as f:
-            lines = f.readlines()
-            # Find data start
-            data_start_idx = 0
-            for i, line in enumerate(lines):
-                if line.strip().startswith('DATA'):
-                    data_start_idx = i + 1
-                    break
-
-            points = []
-            for line in lines[data_start_idx:]:
-                line = line.strip()
-                if line:
-                    values = [float(x) for x in line.split()]
-                    # Extract x, y, z (first 3 coordinates)
-                    if len(values) >= 3:
-                        points.append(values[:3])
-            return np.array(points)
+        num_points = header_info.get('points')
+        fields = header_info.get('fields', [])
+        counts = header_info.get('count', [1] * len(fields))
+        if not {'x', 'y', 'z'}.issubset(fields):
+            raise ValueError("PCD file must contain x, y, z coordinates")
+
+        # Column of each field, accounting for multi-count fields before it
+        columns = {}
+        column = 0
+        for field, count in zip(fields, counts):
+            columns.setdefault(field, column)
+            column += count
+        usecols = (columns['x'], columns['y'], columns['z'])
+
+        with open(pcd_path, 'rb') as f:
+            # Skip header
+            f.seek(header_size)
+            return np.loadtxt(f,
+                              dtype=np.float32,
+                              usecols=usecols,
+                              max_rows=num_points,
+                              ndmin=2)
 
     elif header_info.get('data', '').upper() == 'BINARY':
-        # Binary format
+        # Binary format: decode all points at once with a structured dtype
+        num_points = header_info.get('points', 0)
+        dtype = _pcd_dtype(header_info)
+        if not {'x', 'y', 'z'}.issubset(dtype.names):
+            raise ValueError("PCD file must contain x, y, z coordinates")
+
         with open(pcd_path, 'rb') as f:
             # Skip header
             f.seek(header_size)
+            raw = f.read(num_points * dtype.itemsize)
 
-            points = []
-            num_points = header_info.get('points', 0)
-            fields = header_info.get('fields', [])
-
-            # Find x, y, z indices
-            x_idx = fields.index('x') if 'x' in fields else 0
-            y_idx = fields.index('y') if 'y' in fields else 1
-            z_idx = fields.index('z') if 'z' in fields else 2
-
-            # Read binary data
-            for _ in range(num_points):
-                field_values = []
-                # Read all fields for this point
-                for field in fields:
-                    try:
-                        value = struct.unpack('<f', f.read(4))[0]  # little endian float32
-                        field_values.append(value)
-                    except:
-                        break
-
-                if len(field_values) >= 3:
-                    x = field_values[x_idx]
-                    y = field_values[y_idx]
-                    z = field_values[z_idx]
-                    points.append([x, y, z])
-
-            return np.array(points)
+        data = np.frombuffer(raw, dtype=dtype, count=num_points)
+        return _xyz_from_structured(data)
 
     else:
         raise ValueError(f"Unsupported PCD data format: {header_info.get('data', 'unknown')}")
 
 
-def read_bin(bin_path):
+def read_bin(bin_path, mmap=True):
     """
     Read KITTI-style binary point cloud file.
+
+    With `mmap=True`, the file is memory-mapped instead of read up front, so
+    the returned array is a read-only view backed by the file; call `.copy()`
+    on it if it needs to be modified.
     """
-    scan = np.fromfile(bin_path, dtype=np.float32)
+    # NOTE: An empty file cannot be memory-mapped, so it is always read
+    if mmap and os.path.getsize(bin_path) > 0:
+        scan = np.memmap(bin_path, dtype=np.float32, mode='r')
+    else:
+        scan = np.fromfile(bin_path, dtype=np.float32)
     scan = scan.reshape((-1, 4))
-    return scan[:, :3]  # Return only x, y, z
+    return np.asarray(scan[:, :3])  # Return only x, y, z
 
 
 def read_ply(ply_path):
     """
     Read PLY file without Open3D dependency.
     Supports ASCII and binary PLY formats.
-    Only extracts x, y, z coordinates (ignores normals and other properties).
+    Only extracts x, y, z coordinates (ignores normals and other properties),
+    returned as an (N, 3) float32 array.
     """
     with open(ply_path, 'rb') as f:
-        # Read header
-        header_lines = []
+        # Parse header line by line until `end_header`, which leaves `f`
+        # positioned at the start of the vertex data
+        vertex_count = 0
+        format_type = 'ascii'
+        properties = []
+        property_types = []
+        in_vertex_element = False
+
         while True:
             line = f.readline()
-            if isinstance(line, bytes):
-                line = line.decode('utf-8')
-            line = line.strip()
-            header_lines.append(line)
+            if not line:
+                raise ValueError("PLY header is missing 'end_header'")
+            line = line.decode('utf-8').strip()
 
             if line == 'end_header':
                 break
-
-        # Parse header information
-        vertex_count = 0
-        format_type = 'ascii'
-        properties = []
-
-        for line in header_lines:
-            if line.startswith('element vertex'):
-                vertex_count = int(line.split()[-1])
+            elif line.startswith('element'):
+                in_vertex_element = line.split()[1] == 'vertex'
+                if in_vertex_element:
+                    vertex_count = int(line.split()[-1])
             elif line.startswith('format'):
                 format_type = line.split()[1]
-            elif line.startswith('property float') or line.startswith('property double'):
-                prop_name = line.split()[-1]
-                properties.append(prop_name)
+            elif line.startswith('property') and in_vertex_element:
+                tokens = line.split()
+                if tokens[1] == 'list':
+                    raise ValueError("PLY list properties are not supported for vertices")
+                if tokens[1] not in _PLY_TYPES:
+                    raise ValueError(f"Unsupported PLY property type: {tokens[1]}")
+                property_types.append(tokens[1])
+                properties.append(tokens[-1])
 
         # Find indices of x, y, z coordinates
         x_idx = properties.index('x') if 'x' in properties else None
@@ -164,64 +224,111 @@ def read_ply(ply_path):
         if x_idx is None or y_idx is None or z_idx is None:
             raise ValueError("PLY file must contain x, y, z coordinates")
 
-        points = []
-
         if format_type == 'ascii':
             # ASCII format
-            for _ in range(vertex_count):
-                line = f.readline()
-                if isinstance(line, bytes):
-                    line = line.decode('utf-8')
-                values = line.strip().split()
-                if len(values) >= len(properties):
-                    x = float(values[x_idx])
-                    y = float(values[y_idx])
-                    z = float(values[z_idx])
-                    points.append([x, y, z])
-
-        elif format_type == 'binary_little_endian':
-            # Binary little endian format
-            for _ in range(vertex_count):
-                vertex_data = []
-                for prop in properties:
-                    # Assuming float32 for coordinates
-                    value = struct.unpack('<f', f.read(4))[0]
-                    vertex_data.append(value)
-
-                x = vertex_data[x_idx]
-                y = vertex_data[y_idx]
-                z = vertex_data[z_idx]
-                points.append([x, y, z])
-
-        elif format_type == 'binary_big_endian':
-            # Binary big endian format
-            for _ in range(vertex_count):
-                vertex_data = []
-                for prop in properties:
-                    # Assuming float32 for coordinates
-                    value = struct.unpack('>f', f.read(4))[0]
-                    vertex_data.append(value)
-
-                x = vertex_data[x_idx]
-                y = vertex_data[y_idx]
-                z = vertex_data[z_idx]
-                points.append([x, y, z])
+            points = np.loadtxt(f,
+                                dtype=np.float32,
+                                usecols=(x_idx, y_idx, z_idx),
+                                max_rows=vertex_count,
+                                ndmin=2)
+
+        elif format_type in _PLY_ENDIANNESS:
+            # Binary format: decode all vertices at once with a structured dtype
+            endian = _PLY_ENDIANNESS[format_type]
+            dtype = np.dtype([(name, endian + _PLY_TYPES[ply_type])
+                              for name, ply_type in zip(properties, property_types)])
+            raw = f.read(vertex_count * dtype.itemsize)
+            vertices = np.frombuffer(raw, dtype=dtype, count=vertex_count)
+            points = _xyz_from_structured(vertices)
 
         else:
             raise ValueError(f"Unsupported PLY format: {format_type}")
 
-        return np.array(points)
+        return points
+
+
+# Lazily compiled numba kernel: None until first needed, False if unavailable
+_finite_mask_kernel = None
+
+
+def _get_finite_mask_kernel():
+    """
+    Return the parallel numba finite-row kernel, or None if numba is not
+    installed. numba is imported on first use only, so that importing this
+    module stays cheap.
+    """
+    global _finite_mask_kernel
+    if _finite_mask_kernel is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _finite_mask_kernel = False
+        else:
+
+            @njit(parallel=True, cache=True)
+            def _finite_mask_numba(points):
+                mask = np.empty(points.shape[0], dtype=np.bool_)
+                for i in prange(points.shape[0]):
+                    finite = True
+                    for j in range(points.shape[1]):
+                        if not math.isfinite(points[i, j]):
+                            finite = False
+                            break
+                    mask[i] = finite
+                return mask
+
+            _finite_mask_kernel = _finite_mask_numba
+    return _finite_mask_kernel or None
 
 
-def write_pcd(points, pcd_path):
+def finite_mask(points, use_numba=False):
     """
-    Write points to PCD file in ASCII format.
+    Return a boolean mask of the points whose coordinates are all finite
+    (i.e., neither NaN nor +/-inf).
+
+    With `use_numba=True`, a parallel numba kernel is used if numba is
+    installed. It is opt-in because importing numba and compiling the kernel
+    cost far more than the numpy check saves in a one-shot process; it only
+    pays off when many huge clouds are filtered in a long-running one.
+    """
+    if use_numba and points.ndim == 2:
+        kernel = _get_finite_mask_kernel()
+        if kernel is not None:
+            return kernel(points)
+    return np.isfinite(points).all(axis=1)
+
+
+# Point cloud readers keyed by (lower-case) file extension
+READERS = {
+    '.bin': read_bin,
+    '.pcd': read_pcd,
+    '.ply': read_ply,
+}
+
+
+def read_point_cloud(path):
+    """
+    Read a point cloud file, dispatching on its case-insensitive extension
+    (e.g., `.PLY` and `.ply` both use `read_ply`).
+    Supports the same formats as `READERS` (.bin, .pcd, and .ply).
+    """
+    reader = READERS.get(Path(path).suffix.lower())
+    if reader is None:
+        raise ValueError(f"Unsupported file format: {path}. Use .bin, .pcd, or .ply")
+    return reader(path)
+
+
+def write_pcd(points, pcd_path, binary=False):
+    """
+    Write points to PCD file in ASCII or binary format.
 
     Args:
         points: numpy array of shape (N, 3) with x, y, z coordinates
         pcd_path: output file path
+        binary: if True, write float32 binary data instead of ASCII text
     """
     num_points = points.shape[0]
+    data_format = 'binary' if binary else 'ascii'
 
     header = f"""# .PCD v0.7 - Point Cloud Data file format
 VERSION 0.7
@@ -233,10 +340,12 @@ WIDTH {num_points}
 HEIGHT 1
 VIEWPOINT 0 0 0 1 0 0 0
 POINTS {num_points}
-DATA ascii
+DATA {data_format}
 """
 
-    with open(pcd_path, 'w') as f:
-        f.write(header)
-        for point in points:
-            f.write(f"{point[0]:.6f} {point[1]:.6f} {point[2]:.6f}\n")
\ No newline at end of file
+    with open(pcd_path, 'wb') as f:
+        f.write(header.encode('utf-8'))
+        if binary:
+            np.ascontiguousarray(points, dtype='<f4').tofile(f)
+        else:
+            np.savetxt(f, points, fmt='%.6f %.6f %.6f')
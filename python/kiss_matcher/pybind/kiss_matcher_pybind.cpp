@@ -95,6 +95,26 @@ PYBIND11_MODULE(_kiss_matcher, m) {
            "src"_a,
            "tgt"_a,
            "Match keypoints from Eigen matrices")
+      .def(
+          "estimate",
+          [](KISSMatcher &self, const py::array &src, const py::array &tgt) {
+            // NOTE: Taking a plain `py::array` lets any ndarray (e.g., a strided
+            // `scan[:, :3]` view or float64 input) bind to this overload in
+            // pybind's first, non-converting pass; the cast to a C-contiguous
+            // float32 buffer happens here instead of in the per-point list caster.
+            auto to_points = [](const py::array &array) {
+              auto points =
+                  py::array_t<float, py::array::c_style | py::array::forcecast>::ensure(array);
+              if (!points) {
+                throw py::value_error("Expected a numeric array of shape (N, 3)");
+              }
+              return py::py_array_to_vectors_float<Eigen::Vector3f>(points);
+            };
+            return self.estimate(to_points(src), to_points(tgt));
+          },
+          "src"_a,
+          "tgt"_a,
+          "Estimate transformation from (N, 3) numpy arrays")
       .def("estimate", &KISSMatcher::estimate, "src"_a, "tgt"_a, "Estimate transformation")
       .def("solve",
            &KISSMatcher::solve,
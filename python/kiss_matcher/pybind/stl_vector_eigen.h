@@ -83,6 +83,29 @@ std::vector<EigenVector> py_array_to_vectors_double(
   return eigen_vectors;
 }
 
+// - Same as `py_array_to_vectors_double`, but for np.float32 arrays, which map
+//   onto float Eigen vectors (e.g., Eigen::Vector3f) without a per-point cast.
+template <typename EigenVector>
+std::vector<EigenVector> py_array_to_vectors_float(
+    py::array_t<float, py::array::c_style | py::array::forcecast> array) {
+  int64_t eigen_vector_size = EigenVector::SizeAtCompileTime;
+  if (array.ndim() != 2 || array.shape(1) != eigen_vector_size) {
+    std::string shape = "(";
+    for (py::ssize_t i = 0; i < array.ndim(); ++i) {
+      shape += (i > 0 ? ", " : "") + std::to_string(array.shape(i));
+    }
+    shape += array.ndim() == 1 ? ",)" : ")";
+    throw py::value_error("Expected an array of shape (N, " + std::to_string(eigen_vector_size) +
+                          "), but got shape " + shape);
+  }
+  std::vector<EigenVector> eigen_vectors(array.shape(0));
+  auto array_unchecked = array.unchecked<2>();
+  for (auto i = 0; i < array_unchecked.shape(0); ++i) {
+    eigen_vectors[i] = Eigen::Map<const EigenVector>(&array_unchecked(i, 0));
+  }
+  return eigen_vectors;
+}
+
 }  // namespace pybind11
 
 template <typename EigenVector,
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Basic tests for the KISS-Matcher point cloud I/O utilities.
+"""
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from kiss_matcher import io_utils
+from kiss_matcher.io_utils import finite_mask, read_point_cloud, write_pcd
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+
+def _pcd_header(fields, sizes, types, counts, num_points, data, newline="\n"):
+    lines = [
+        "# .PCD v0.7 - Point Cloud Data file format",
+        "VERSION 0.7",
+        "FIELDS " + " ".join(fields),
+        "SIZE " + " ".join(map(str, sizes)),
+        "TYPE " + " ".join(types),
+        "COUNT " + " ".join(map(str, counts)),
+        f"WIDTH {num_points}",
+        "HEIGHT 1",
+        "VIEWPOINT 0 0 0 1 0 0 0",
+        f"POINTS {num_points}",
+        f"DATA {data}",
+    ]
+    return (newline.join(lines) + newline).encode('utf-8')
+
+
+def _ply_header(lines):
+    return ("\n".join(lines) + "\n").encode('utf-8')
+
+
+class PointCloudFileTestCase(unittest.TestCase):
+    """Shared fixture: a temporary directory and a seeded random cloud."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.rng = np.random.default_rng(42)
+        self.points = self.rng.random((10, 3), dtype=np.float32)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _path(self, file_name):
+        return os.path.join(self.tmp_dir.name, file_name)
+
+    def _write(self, path, header, body):
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(body)
+
+
+class TestReadPointCloud(PointCloudFileTestCase):
+    """Test extension-based dispatch in read_point_cloud."""
+
+    def test_bin_extension_is_case_insensitive(self):
+        """Test that .Bin files are read as KITTI scans."""
+        path = self._path("scan.Bin")
+        scan = np.hstack([self.points, np.ones((10, 1), dtype=np.float32)])
+        scan.tofile(path)
+
+        np.testing.assert_array_equal(read_point_cloud(path), self.points)
+
+    def test_pcd_extension_is_case_insensitive(self):
+        """Test that .PCD files are read as PCD."""
+        path = self._path("cloud.PCD")
+        write_pcd(self.points, path, binary=True)
+
+        np.testing.assert_array_equal(read_point_cloud(path), self.points)
+
+    def test_ply_extension_is_case_insensitive(self):
+        """Test that .PLY files are read as PLY."""
+        path = self._path("cloud.PLY")
+        header = _ply_header([
+            "ply", "format binary_little_endian 1.0", "element vertex 10",
+            "property float x", "property float y", "property float z", "end_header"
+        ])
+        self._write(path, header, self.points.astype('<f4').tobytes())
+
+        np.testing.assert_array_equal(read_point_cloud(path), self.points)
+
+    def test_unsupported_extension(self):
+        """Test that unknown extensions raise ValueError."""
+        with self.assertRaises(ValueError):
+            read_point_cloud(self._path("cloud.xyz"))
+
+
+class TestReadBin(PointCloudFileTestCase):
+    """Test read_bin on KITTI-style scans."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = self._path("scan.bin")
+        scan = np.hstack([self.points, np.ones((10, 1), dtype=np.float32)])
+        scan.tofile(self.path)
+
+    def test_mmap_returns_read_only_view(self):
+        """Test that the memory-mapped cloud is read-only."""
+        points = io_utils.read_bin(self.path)
+
+        np.testing.assert_array_equal(points, self.points)
+        self.assertIs(points.flags.writeable, False)
+
+    def test_fromfile_returns_writable_array(self):
+        """Test that mmap=False still returns a writable array."""
+        points = io_utils.read_bin(self.path, mmap=False)
+
+        np.testing.assert_array_equal(points, self.points)
+        self.assertIs(points.flags.writeable, True)
+
+    def test_empty_bin(self):
+        """Test that an empty .bin file yields an empty (0, 3) cloud."""
+        path = self._path("empty.bin")
+        open(path, 'wb').close()
+
+        for mmap in (True, False):
+            self.assertEqual(io_utils.read_bin(path, mmap=mmap).shape, (0, 3))
+
+
+class TestReadPcd(PointCloudFileTestCase):
+    """Test read_pcd on binary and ASCII layouts."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = self._path("cloud.pcd")
+
+    def test_binary_with_repeated_padding_fields(self):
+        """Test Ouster-style layouts with repeated `_` padding fields."""
+        dtype = np.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('_0', 'u1'),
+                          ('intensity', '<f4'), ('_1', 'u1', (3,)), ('ring', '<u2')])
+        data = np.zeros(10, dtype=dtype)
+        data['x'], data['y'], data['z'] = self.points.T
+        header = _pcd_header(['x', 'y', 'z', '_', 'intensity', '_', 'ring'],
+                             [4, 4, 4, 1, 4, 1, 2], ['F', 'F', 'F', 'U', 'F', 'U', 'U'],
+                             [1, 1, 1, 1, 1, 3, 1], 10, 'binary')
+        self._write(self.path, header, data.tobytes())
+
+        np.testing.assert_array_equal(io_utils.read_pcd(self.path), self.points)
+
+    def test_binary_with_crlf_header(self):
+        """Test that CRLF header lines do not shift the data offset."""
+        header = _pcd_header(['x', 'y', 'z'], [4, 4, 4], ['F', 'F', 'F'], [1, 1, 1],
+                             10, 'binary', newline="\r\n")
+        self._write(self.path, header, self.points.astype('<f4').tobytes())
+
+        np.testing.assert_array_equal(io_utils.read_pcd(self.path), self.points)
+
+    def test_ascii_with_multi_count_field_before_xyz(self):
+        """Test that COUNT > 1 fields shift the x, y, z columns."""
+        header = _pcd_header(['normal', 'x', 'y', 'z'], [4, 4, 4, 4], ['F', 'F', 'F', 'F'],
+                             [3, 1, 1, 1], 10, 'ascii', newline="\r\n")
+        rows = "".join(f"9 9 9 {x:.6f} {y:.6f} {z:.6f}\r\n" for x, y, z in self.points)
+        self._write(self.path, header, rows.encode('utf-8'))
+
+        np.testing.assert_allclose(io_utils.read_pcd(self.path), self.points, atol=1e-6)
+
+    def test_ascii_round_trip(self):
+        """Test that write_pcd output in ASCII is read back."""
+        write_pcd(self.points, self.path)
+
+        np.testing.assert_allclose(io_utils.read_pcd(self.path), self.points, atol=1e-6)
+
+    def test_truncated_binary_data(self):
+        """Test that missing point data raises ValueError."""
+        header = _pcd_header(['x', 'y', 'z'], [4, 4, 4], ['F', 'F', 'F'], [1, 1, 1],
+                             10, 'binary')
+        self._write(self.path, header, self.points[:5].astype('<f4').tobytes())
+
+        with self.assertRaises(ValueError):
+            io_utils.read_pcd(self.path)
+
+    def test_truncated_header(self):
+        """Test that a header without a DATA line raises ValueError."""
+        header = _pcd_header(['x', 'y', 'z'], [4, 4, 4], ['F', 'F', 'F'], [1, 1, 1],
+                             10, 'binary')
+        self._write(self.path, header.rsplit(b"DATA", 1)[0], b"")
+
+        with self.assertRaises(ValueError):
+            io_utils.read_pcd(self.path)
+
+
+class TestReadPly(PointCloudFileTestCase):
+    """Test read_ply on binary and ASCII layouts."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = self._path("cloud.ply")
+
+    def test_big_endian_double(self):
+        """Test big-endian double vertices."""
+        points = self.rng.random((10, 3))
+        self._write(self.path, _ply_header([
+            "ply", "format binary_big_endian 1.0", "element vertex 10",
+            "property double x", "property double y", "property double z", "end_header"
+        ]), points.astype('>f8').tobytes())
+
+        result = io_utils.read_ply(self.path)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, points, rtol=1e-6)
+
+    def test_mixed_property_types(self):
+        """Test vertices mixing uchar colors and float32 coordinates."""
+        dtype = np.dtype([('red', 'u1'), ('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+                          ('green', 'u1'), ('blue', 'u1')])
+        data = np.zeros(10, dtype=dtype)
+        data['x'], data['y'], data['z'] = self.points.T
+        self._write(self.path, _ply_header([
+            "ply", "format binary_little_endian 1.0", "element vertex 10",
+            "property uchar red", "property float32 x", "property float32 y",
+            "property float32 z", "property uchar green", "property uchar blue", "end_header"
+        ]), data.tobytes())
+
+        np.testing.assert_array_equal(io_utils.read_ply(self.path), self.points)
+
+    def test_ascii_with_face_element(self):
+        """Test that a face element after the vertices is ignored."""
+        rows = "".join(f"{x:.6f} {y:.6f} {z:.6f} 255\n" for x, y, z in self.points)
+        self._write(self.path, _ply_header([
+            "ply", "format ascii 1.0", "element vertex 10",
+            "property float x", "property float y", "property float z",
+            "property uchar red", "element face 1",
+            "property list uchar int vertex_indices", "end_header"
+        ]), (rows + "3 0 1 2\n").encode('utf-8'))
+
+        np.testing.assert_allclose(io_utils.read_ply(self.path), self.points, atol=1e-6)
+
+    def test_unsupported_property_type(self):
+        """Test that an unknown property type raises ValueError."""
+        self._write(self.path, _ply_header([
+            "ply", "format binary_little_endian 1.0", "element vertex 10",
+            "property float x", "property float y", "property float z",
+            "property half w", "end_header"
+        ]), b"")
+
+        with self.assertRaises(ValueError):
+            io_utils.read_ply(self.path)
+
+
+class TestFiniteMask(unittest.TestCase):
+    """Test finite_mask on NaN and +/-inf coordinates."""
+
+    def setUp(self):
+        self.points = np.array([
+            [1.0, 2.0, 3.0],
+            [np.nan, 1.0, 1.0],
+            [1.0, np.inf, 1.0],
+            [1.0, 1.0, -np.inf],
+            [np.nan, np.nan, np.nan],
+            [0.0, 0.0, 0.0],
+        ], dtype=np.float32)
+        self.expected = np.array([True, False, False, False, False, True])
+
+    def test_numpy_path(self):
+        """Test that a point is kept only if all coordinates are finite."""
+        np.testing.assert_array_equal(finite_mask(self.points), self.expected)
+
+    @unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+    def test_numba_path_matches_numpy(self):
+        """Test that the numba kernel agrees with numpy, incl. strided views."""
+        scan = np.hstack([self.points, np.ones((6, 1), dtype=np.float32)])
+        np.testing.assert_array_equal(finite_mask(self.points, use_numba=True), self.expected)
+        np.testing.assert_array_equal(finite_mask(scan[:, :3], use_numba=True), self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
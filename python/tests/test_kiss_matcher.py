@@ -45,18 +45,27 @@ class TestKISSMatcher(unittest.TestCase):
             matcher = km.KISSMatcher(0.3)
 
             # Create larger point clouds for better matching
-            src_points = np.random.rand(100, 3).astype(np.float32)
+            src_points = np.random.rand(100, 3)
             tgt_points = src_points.copy()  # Use same points for target
 
-            # Convert to vector format if needed
-            src_vector = [src_points[i] for i in range(src_points.shape[0])]
-            tgt_vector = [tgt_points[i] for i in range(tgt_points.shape[0])]
-
             # This should not crash - actual matching may fail due to random data
-            # but the binding should work
-            result = matcher.match(src_vector, tgt_vector)
-            self.assertIsInstance(result, km.RegistrationSolution)
+            # but the binding should work. The (3, N) float64 views map onto the
+            # Eigen::Matrix<double, 3, Eigen::Dynamic> overload in one buffer copy,
+            # instead of converting a Python list of N points one by one.
+            result = matcher.match(src_points.T, tgt_points.T)
+
+            # `match` returns the matched keypoints as a (src, tgt) pair
+            self.assertIsInstance(result, tuple)
+            self.assertEqual(len(result), 2)
+            src_matched, tgt_matched = result
+            self.assertIsInstance(src_matched, list)
+            self.assertIsInstance(tgt_matched, list)
+            self.assertEqual(len(src_matched), len(tgt_matched))
+            for point in src_matched + tgt_matched:
+                self.assertEqual(np.asarray(point).shape, (3,))
 
+        except AssertionError:
+            raise
         except Exception as e:
             # If there's an issue with the binding itself, we want to know
             if "AttributeError" in str(type(e)) or "TypeError" in str(type(e)):
@@ -64,6 +73,29 @@ class TestKISSMatcher(unittest.TestCase):
             # Other errors might be expected with random data
             pass
 
+    def test_estimate_with_numpy_arrays(self):
+        """Test estimate with (N, 3) float32, float64, and strided numpy arrays."""
+        matcher = km.KISSMatcher(0.3)
+        src_points = np.random.rand(100, 3) * 10.0
+        tgt_points = src_points.copy()
+
+        for dtype in (np.float32, np.float64):
+            result = matcher.estimate(src_points.astype(dtype), tgt_points.astype(dtype))
+            self.assertIsInstance(result, km.RegistrationSolution)
+
+        # Strided (N, 3) view of a KITTI-style (N, 4) scan, as returned by read_bin
+        scan = np.hstack([src_points, np.ones((100, 1))]).astype(np.float32)
+        result = matcher.estimate(scan[:, :3], scan[:, :3])
+        self.assertIsInstance(result, km.RegistrationSolution)
+
+    def test_estimate_with_wrong_shape(self):
+        """Test that estimate rejects arrays that are not (N, 3)."""
+        matcher = km.KISSMatcher(0.3)
+        points = np.random.rand(3, 100).astype(np.float32)
+
+        with self.assertRaises(ValueError):
+            matcher.estimate(points, points)
+
     def test_version_attribute(self):
         """Test that version attribute exists."""
         self.assertTrue(hasattr(km, '__version__'))